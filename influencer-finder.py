@@ -5,28 +5,65 @@
 インフルエンサー検索・連絡先収集ツール
 
 必要なライブラリ:
-pip install streamlit requests beautifulsoup4 google-api-python-client gspread google-auth pandas
+pip install streamlit requests selectolax google-re2 google-api-python-client gspread google-auth pandas
 """
 
 import os
-import re
+import re2
+import codecs
 import json
+import gzip
+import hashlib
 import time
 import random
 import tempfile
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional, Union, Tuple
 from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 import gspread
 from google.oauth2.service_account import Credentials
-import base64
 import io
 
+# 正規表現パターン（全インスタンスで共有し、再実行や複数インスタンス生成時に再コンパイルしない）
+# HTMLのバイト列を直接走査するパターンは、ページ全体をデコードしなくて済むようbytesでコンパイル
+# メールアドレス抽出用（長大なHTMLでもバックトラックしないようre2で線形時間照合）
+EMAIL_RE = re2.compile(rb'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# SNSプロフィールページのURL抽出用（グループ名がSNSタイプ、1回の走査で全SNSを検索）
+SNS_URL_RE = re2.compile(
+    rb'(?P<instagram>(?:https?://)?(?:www\.)?instagram\.com/[a-zA-Z0-9_.]+/?)'
+    rb'|(?P<tiktok>(?:https?://)?(?:www\.)?tiktok\.com/@[a-zA-Z0-9_.]+/?)'
+    rb'|(?P<youtube>(?:https?://)?(?:www\.)?youtube\.com/(?:(?:channel|user|c)/|@)[a-zA-Z0-9_-]+/?)'
+    rb'|(?P<x>(?:https?://)?(?:www\.)?(?:twitter|x)\.com/[a-zA-Z0-9_]+/?)'
+    rb'|(?P<facebook>(?:https?://)?(?:www\.)?facebook\.com/[a-zA-Z0-9.]+/?)'
+)
+
+# meta要素で宣言された文字コード（<meta charset="..."> / <meta http-equiv=... content="...; charset=...">）
+META_CHARSET_RE = re2.compile(rb'(?i)<meta[^>]*?charset\s*=\s*["\']?([a-z0-9_.:-]+)')
+
+# リンク先ドメインからSNSタイプを判定（グループ名がSNSタイプ）
+SNS_DOMAIN_RE = re2.compile(
+    r'(?P<instagram>instagram\.com)'
+    r'|(?P<tiktok>tiktok\.com)'
+    r'|(?P<youtube>youtube\.com|youtu\.be)'
+    r'|(?P<x>twitter\.com|x\.com)'
+    r'|(?P<facebook>facebook\.com)'
+)
+
+# タイトルの区切り文字（「|」「-」「:」など）
+TITLE_SEP_RE = re2.compile(r'[|\-:：／/｜]')
+
 # ページ設定
 st.set_page_config(
     page_title="インフルエンサー検索・連絡先収集ツール",
@@ -58,34 +95,36 @@ class InfluencerFinder:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
         
-        # メールアドレス抽出用の正規表現パターン
-        self.email_pattern = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
-        
-        # SNSプロフィールページのURL抽出用パターン
-        self.sns_patterns = {
-            'instagram': [
-                re.compile(r'https?://(?:www\.)?instagram\.com/[a-zA-Z0-9_.]+/?'),
-                re.compile(r'instagram\.com/[a-zA-Z0-9_.]+/?')
-            ],
-            'tiktok': [
-                re.compile(r'https?://(?:www\.)?tiktok\.com/@[a-zA-Z0-9_.]+/?'),
-                re.compile(r'tiktok\.com/@[a-zA-Z0-9_.]+/?')
-            ],
-            'youtube': [
-                re.compile(r'https?://(?:www\.)?youtube\.com/(?:channel|user|c)/[a-zA-Z0-9_-]+/?'),
-                re.compile(r'https?://(?:www\.)?youtube\.com/@[a-zA-Z0-9_-]+/?'),
-                re.compile(r'youtube\.com/(?:channel|user|c)/[a-zA-Z0-9_-]+/?'),
-                re.compile(r'youtube\.com/@[a-zA-Z0-9_-]+/?')
-            ],
-            'x_twitter': [
-                re.compile(r'https?://(?:www\.)?(?:twitter|x)\.com/[a-zA-Z0-9_]+/?'),
-                re.compile(r'(?:twitter|x)\.com/[a-zA-Z0-9_]+/?')
-            ],
-            'facebook': [
-                re.compile(r'https?://(?:www\.)?facebook\.com/[a-zA-Z0-9.]+/?'),
-                re.compile(r'facebook\.com/[a-zA-Z0-9.]+/?')
-            ]
-        }
+        # コネクションプールを拡張し、429/5xxレスポンス時のみ指数バックオフで再試行
+        # （接続エラーや読み込みタイムアウトは再試行しない。Retry-Afterヘッダには上限がなく、メンテナンス中のサイトでワーカーが長時間止まるため従わない）
+        retry = Retry(
+            total=3,
+            connect=0,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 並列スキャンの設定
+        self.max_workers = 8  # 同時に取得するページ数の上限
+        self.max_content_bytes = 512_000  # 1ページあたりに読み込む最大バイト数
+        self.html_content_types = {'text/html', 'application/xhtml+xml'}
+        
+        # 取得したページのディスクキャッシュ（再検索時の再取得を避ける）
+        self.cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'influencer-finder')
+        self.cache_ttl = 24 * 60 * 60  # キャッシュの有効期間（秒）
+        
+        # ホストごとの最終アクセス時刻（サーバー負荷軽減のためのアクセス間隔制御）
+        self._host_last_access: Dict[str, float] = {}
+        self._host_lock = threading.Lock()
+        
+        # メールアドレスと誤検出しやすい画像ファイル名（例: logo@2x.png）の拡張子
+        self.email_excluded_suffixes = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
     
     def search_google(self, query: str, api_key: str, cx: str, num_results: int = 20) -> List[Dict[str, Any]]:
         """
@@ -106,25 +145,26 @@ class InfluencerFinder:
             # 複数ページの結果を取得
             all_results = []
             pages = (num_results + 9) // 10  # 10件ずつ取得するため、必要なページ数を計算
+            requests_by_page = [
+                service.cse().list(q=query, cx=cx, start=page * 10 + 1)
+                for page in range(pages)
+            ]
             
-            for page in range(pages):
-                start_index = page * 10 + 1
-                
-                # API呼び出し
-                result = service.cse().list(
-                    q=query,
-                    cx=cx,
-                    start=start_index
-                ).execute()
-                
+            # 各ページを並列に取得（HTTPクライアントはスレッドセーフでないためリクエストごとにタイムアウト付きで作成、
+            # 429/5xxはクライアントライブラリの指数バックオフで再試行）
+            with ThreadPoolExecutor(max_workers=max(pages, 1)) as executor:
+                futures = [
+                    executor.submit(request.execute, http=build_http(), num_retries=3)
+                    for request in requests_by_page
+                ]
+                page_results = [future.result() for future in futures]
+            
+            for result in page_results:
                 # 結果がない場合は終了
                 if 'items' not in result:
                     break
                     
                 all_results.extend(result['items'])
-                
-                # APIレート制限に配慮して少し待機
-                time.sleep(0.5)
             
             # 検索結果を整形
             formatted_results = []
@@ -164,16 +204,8 @@ class InfluencerFinder:
         Returns:
             推定された企業名/個人名
         """
-        # 「|」「-」「:」などで分割し、最初の部分を取得
-        separators = ['|', '-', ':', '：', '／', '/', '｜']
-        company_name = title
-        
-        for sep in separators:
-            if sep in company_name:
-                parts = company_name.split(sep)
-                company_name = parts[0].strip()
-        
-        return company_name
+        # 「|」「-」「:」などの最初の区切り文字で分割し、最初の部分を取得
+        return TITLE_SEP_RE.split(title, maxsplit=1)[0].strip()
     
     def extract_contact_info(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -190,39 +222,20 @@ class InfluencerFinder:
             return result
         
         try:
-            # Webページを取得
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # ページのエンコーディングを確認
-            if 'Content-Type' in response.headers:
-                content_type = response.headers['Content-Type']
-                if 'charset=' in content_type:
-                    encoding = content_type.split('charset=')[1].split(';')[0].strip()
-                    response.encoding = encoding
-            
-            # BeautifulSoupでHTMLを解析
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # スクリプトとスタイルタグを削除
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            # テキスト抽出
-            text = soup.get_text()
+            # Webページを取得（キャッシュがあればそれを使用）
+            html_bytes = self._cached_get(url)
+            if html_bytes is None:
+                return result
             
-            # HTMLソース全体
-            html_source = response.text
+            # メールアドレスを抽出（表示テキストはHTMLソースに含まれるためソースのみを走査）
+            email = self._extract_email(html_bytes)
+            if email:
+                result['email'] = email
             
-            # メールアドレスを抽出
-            emails = self._extract_emails(text)
-            emails.extend(self._extract_emails(html_source))  # HTMLソースからも抽出
-            if emails:
-                result['email'] = emails[0]  # 最初のメールアドレスを使用
-            
-            # SNSリンクを抽出
-            sns_urls = self._extract_sns_urls(html_source)
-            sns_urls.update(self._extract_sns_urls_from_links(soup))
+            # SNSリンクを抽出（リンクの列挙はselectolaxのCSSセレクタで行う）
+            tree = LexborHTMLParser(html_bytes)
+            sns_urls = self._extract_sns_urls(html_bytes)
+            sns_urls.update(self._extract_sns_urls_from_links(tree))
             
             # 結果を更新
             for sns_type, url in sns_urls.items():
@@ -235,31 +248,154 @@ class InfluencerFinder:
             st.warning(f"URL解析中にエラーが発生しました: {url} - {str(e)}")
             return result
     
-    def _extract_emails(self, text: str) -> List[str]:
+    def _cached_get(self, url: str) -> Optional[bytes]:
         """
-        テキストからメールアドレスを抽出
+        ディスクキャッシュを参照しながらWebページのHTMLを取得
         
         Args:
-            text: 検索対象のテキスト
+            url: 取得するURL
             
         Returns:
-            メールアドレスのリスト
+            HTMLのバイト列（HTML以外のコンテンツの場合はNone）
         """
-        if not text:
-            return []
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        cache_path = os.path.join(self.cache_dir, key[:2], f"{key}.html.gz")
+        
+        # 有効期間内のキャッシュがあればそれを返し、期限切れのキャッシュは削除
+        try:
+            if time.time() - os.path.getmtime(cache_path) < self.cache_ttl:
+                with gzip.open(cache_path, 'rb') as f:
+                    return f.read()
+            os.remove(cache_path)
+        except (OSError, EOFError):
+            pass
+        
+        # Webページを取得（ストリーミングで先頭部分のみ読み込む）
+        response = self._fetch(url)
+        try:
+            response.raise_for_status()
+            
+            # HTML以外（PDFや画像など）は本文を読まずにスキップ
+            content_type = response.headers.get('Content-Type', '')
+            mime_type = content_type.split(';')[0].strip().lower()
+            if mime_type and mime_type not in self.html_content_types:
+                return None
+            
+            html_bytes = response.raw.read(self.max_content_bytes, decode_content=True)
+        finally:
+            response.close()
+        
+        html_bytes = self._to_utf8(html_bytes, content_type)
+        
+        # 一時ファイルに書き込んでから置き換え、書き込み途中のキャッシュを読まないようにする
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path), delete=False, suffix='.tmp') as temp:
+                temp_path = temp.name
+                temp.write(gzip.compress(html_bytes))
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # キャッシュの書き込みに失敗しても処理は続行（一時ファイルは残さない）
+            if temp_path:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+        
+        return html_bytes
+    
+    def _to_utf8(self, html_bytes: bytes, content_type: str) -> bytes:
+        """
+        UTF-8以外の文字コードで宣言されたHTMLをUTF-8に変換
+        
+        Shift_JISでは2バイト文字の2バイト目がASCII英字と重なるため（例: 「ス」は0x83 0x58）、
+        変換せずにバイト列を走査するとメールアドレスの前に余分な文字が付いてしまう。
+        
+        Args:
+            html_bytes: HTMLのバイト列
+            content_type: Content-Typeヘッダの値
+            
+        Returns:
+            UTF-8のHTMLのバイト列（文字コードが宣言されていない・不明な場合はそのまま）
+        """
+        # Content-Typeヘッダの文字コードを優先し、なければmeta要素の宣言を確認
+        charset = ''
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[1].split(';')[0].strip().strip('"\'')
+        else:
+            match = META_CHARSET_RE.search(html_bytes[:4096])
+            if match:
+                charset = match.group(1).decode('ascii')
+        
+        if not charset:
+            return html_bytes
+        
+        try:
+            if codecs.lookup(charset).name in ('utf-8', 'ascii'):
+                return html_bytes
+            return html_bytes.decode(charset, 'replace').encode('utf-8')
+        except LookupError:
+            return html_bytes
+    
+    def _wait_for_host(self, url: str) -> None:
+        """
+        同一ホストへのアクセス間隔を空けるために待機
+        
+        Args:
+            url: アクセスするURL
+        """
+        host = urlparse(url).netloc
+        
+        # 次にアクセスできる時刻を予約してからロック外で待機する
+        with self._host_lock:
+            now = time.monotonic()
+            scheduled = max(now, self._host_last_access.get(host, 0.0) + random.uniform(0.5, 1.5))
+            self._host_last_access[host] = scheduled
+        
+        if scheduled > now:
+            time.sleep(scheduled - now)
+    
+    def _fetch(self, url: str) -> requests.Response:
+        """
+        ホストごとのアクセス間隔を守ってWebページを取得（再試行はセッションのアダプタが行う）
+        
+        Args:
+            url: 取得するURL
+            
+        Returns:
+            本文が未読み込みのストリーミングレスポンス
+        """
+        self._wait_for_host(url)
+        return self.session.get(url, timeout=10, stream=True)
+    
+    def _extract_email(self, html_bytes: bytes) -> Optional[str]:
+        """
+        HTMLのバイト列から最初のメールアドレスを抽出
         
-        # メールアドレスを検索
-        emails = self.email_pattern.findall(text)
+        Args:
+            html_bytes: 検索対象のHTMLのバイト列
+            
+        Returns:
+            メールアドレス（見つからない場合はNone）
+        """
+        if not html_bytes:
+            return None
         
-        # 重複を削除して返す
-        return list(set(emails))
+        # 最初に見つかった画像ファイル名以外のマッチを返す（デコードはマッチ部分のみ）
+        for match in EMAIL_RE.finditer(html_bytes):
+            email = match.group(0).decode('utf-8', 'ignore')
+            if not email.lower().endswith(self.email_excluded_suffixes):
+                return email
+        
+        return None
     
-    def _extract_sns_urls(self, text: str) -> Dict[str, str]:
+    def _extract_sns_urls(self, html_bytes: bytes) -> Dict[str, str]:
         """
-        テキストからSNS URLを抽出
+        HTMLのバイト列からSNS URLを抽出
         
         Args:
-            text: 検索対象のテキスト
+            html_bytes: 検索対象のHTMLのバイト列
             
         Returns:
             SNSタイプとURLの辞書
@@ -272,33 +408,34 @@ class InfluencerFinder:
             'facebook': ''
         }
         
-        # 各SNSのパターンでURLを検索
-        for sns_type, patterns in self.sns_patterns.items():
-            for pattern in patterns:
-                matches = pattern.findall(text)
-                if matches:
-                    # 最初のマッチを使用
-                    url = matches[0]
-                    
-                    # プロトコルがない場合は追加
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    
-                    # SNSタイプに応じてキーを設定
-                    if sns_type == 'x_twitter':
-                        sns_urls['x'] = url
-                    else:
-                        sns_urls[sns_type] = url
-                    break
+        # 全SNSのパターンで一度だけ走査し、SNSタイプごとに最初のマッチを使用
+        remaining = len(sns_urls)
+        for match in SNS_URL_RE.finditer(html_bytes):
+            sns_type = match.lastgroup.decode('ascii')  # bytesパターンではグループ名もbytesで返る
+            if sns_urls[sns_type]:
+                continue
+            
+            url = match.group(0).decode('utf-8', 'ignore')
+            
+            # プロトコルがない場合は追加
+            if not url.startswith('http'):
+                url = 'https://' + url
+            
+            sns_urls[sns_type] = url
+            
+            # 全SNSが見つかったら終了
+            remaining -= 1
+            if not remaining:
+                break
         
         return sns_urls
     
-    def _extract_sns_urls_from_links(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def _extract_sns_urls_from_links(self, tree: LexborHTMLParser) -> Dict[str, str]:
         """
         HTMLのリンクからSNS URLを抽出
         
         Args:
-            soup: BeautifulSoupオブジェクト
+            tree: LexborHTMLParserオブジェクト
             
         Returns:
             SNSタイプとURLの辞書
@@ -311,31 +448,14 @@ class InfluencerFinder:
             'facebook': ''
         }
         
-        # aタグを取得
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            href = link.get('href', '')
-            
-            # Instagramリンク
-            if 'instagram.com' in href:
-                sns_urls['instagram'] = href
-            
-            # TikTokリンク
-            elif 'tiktok.com' in href:
-                sns_urls['tiktok'] = href
+        # href属性を持つaタグを取得
+        for node in tree.css('a[href]'):
+            href = node.attributes.get('href') or ''
             
-            # YouTubeリンク
-            elif 'youtube.com' in href or 'youtu.be' in href:
-                sns_urls['youtube'] = href
-            
-            # Twitter/Xリンク
-            elif 'twitter.com' in href or 'x.com' in href:
-                sns_urls['x'] = href
-            
-            # Facebookリンク
-            elif 'facebook.com' in href:
-                sns_urls['facebook'] = href
+            # マッチしたグループ名をSNSタイプとして使用
+            match = SNS_DOMAIN_RE.search(href)
+            if match:
+                sns_urls[match.lastgroup] = href
         
         return sns_urls
     
@@ -350,26 +470,35 @@ class InfluencerFinder:
         Returns:
             コンタクト情報付きの検索結果
         """
-        processed_results = []
+        targets = results[:max_pages_to_scan]
+        total = len(targets)
+        
+        # 元の順序を保つため、インデックスごとに結果を格納
+        processed_results = list(targets)
         
         # プログレスバーを表示
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i, result in enumerate(results[:max_pages_to_scan]):
-            status_text.text(f"処理中... {i+1}/{min(len(results), max_pages_to_scan)}: {result['title']}")
-            progress_percent = (i + 1) / min(len(results), max_pages_to_scan)
-            progress_bar.progress(progress_percent)
-            
-            # リンク先のページからコンタクト情報を抽出
-            if result.get('website_url'):
-                updated_result = self.extract_contact_info(result.copy())
-                processed_results.append(updated_result)
-            else:
-                processed_results.append(result)
-            
-            # サーバー負荷軽減のため少し待機
-            time.sleep(random.uniform(0.5, 1.5))
+        # ワーカースレッドからもStreamlitの警告表示ができるようにコンテキストを引き継ぐ
+        ctx = get_script_run_ctx()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            # リンク先のページからコンタクト情報を抽出（サーバー負荷はホストごとのアクセス間隔で制御）
+            futures = {
+                executor.submit(self.extract_contact_info, result): i
+                for i, result in enumerate(targets)
+                if result.get('website_url')
+            }
+            
+            done = total - len(futures)
+            for future in as_completed(futures):
+                i = futures[future]
+                processed_results[i] = future.result()
+                
+                done += 1
+                status_text.text(f"処理中... {done}/{total}: {targets[i]['title']}")
+                progress_bar.progress(done / total)
         
         status_text.text("処理完了!")
         time.sleep(1)
@@ -379,16 +508,26 @@ class InfluencerFinder:
         return processed_results
 
 
-def export_to_csv(data: List[Dict[str, Any]], filename: str) -> Optional[str]:
+@st.cache_resource
+def get_finder() -> InfluencerFinder:
+    """
+    再実行間で共有するInfluencerFinderを取得（セッションのコネクションプールを再利用）
+    
+    Returns:
+        InfluencerFinderのインスタンス
+    """
+    return InfluencerFinder()
+
+
+def export_to_csv(data: List[Dict[str, Any]]) -> Optional[bytes]:
     """
     データをCSVファイルにエクスポート
     
     Args:
         data: エクスポートするデータ
-        filename: 出力するCSVファイル名
         
     Returns:
-        ダウンロードリンク用のHTML
+        ダウンロード用のCSVデータ（UTF-8）
     """
     if not data:
         return None
@@ -400,24 +539,11 @@ def export_to_csv(data: List[Dict[str, Any]], filename: str) -> Optional[str]:
             'youtube_url', 'x_url', 'facebook_url', 'email'
         ]
         
-        # 必要なカラムだけを抽出
-        filtered_data = []
-        for item in data:
-            filtered_item = {col: item.get(col, '') for col in columns}
-            filtered_data.append(filtered_item)
-        
-        # DataFrameに変換
-        df = pd.DataFrame(filtered_data)
+        # 必要なカラムだけを抽出してDataFrameに変換
+        df = pd.DataFrame.from_records(data, columns=columns).fillna('')
         
         # CSVデータの作成
-        csv = df.to_csv(index=False)
-        
-        # CSVのエンコード
-        b64 = base64.b64encode(csv.encode()).decode()
-        
-        # ダウンロードリンクの作成
-        href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">CSVファイルをダウンロード</a>'
-        return href
+        return df.to_csv(index=False).encode('utf-8')
         
     except Exception as e:
         st.error(f"CSVエクスポート中にエラーが発生しました: {str(e)}")
@@ -444,25 +570,11 @@ def export_to_google_spreadsheet(data: List[Dict[str, Any]], service_account_jso
             'youtube_url', 'x_url', 'facebook_url', 'email'
         ]
         
-        # 必要なカラムだけを抽出
-        filtered_data = []
-        for item in data:
-            filtered_item = {col: item.get(col, '') for col in columns}
-            filtered_data.append(filtered_item)
-        
-        # 一時ファイルに書き込み
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.json') as temp:
-            json.dump(json.loads(service_account_json), temp)
-            temp_path = temp.name
-        
         # 認証
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        credentials = Credentials.from_service_account_file(temp_path, scopes=scope)
+        credentials = Credentials.from_service_account_info(json.loads(service_account_json), scopes=scope)
         gc = gspread.authorize(credentials)
         
-        # 一時ファイルを削除
-        os.unlink(temp_path)
-        
         # スプレッドシートを開く
         try:
             spreadsheet = gc.open_by_key(spreadsheet_id)
@@ -473,19 +585,38 @@ def export_to_google_spreadsheet(data: List[Dict[str, Any]], service_account_jso
         # シートを取得または作成
         try:
             worksheet = spreadsheet.worksheet(sheet_name)
-            worksheet.clear()  # 既存のデータをクリア
         except gspread.exceptions.WorksheetNotFound:
             worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
         
-        # DataFrameに変換
-        df = pd.DataFrame(filtered_data)
+        # 必要なカラムだけを抽出してDataFrameに変換
+        df = pd.DataFrame.from_records(data, columns=columns).fillna('')
         
         # ヘッダと値を分離
         header = df.columns.tolist()
         values = df.values.tolist()
         
-        # スプレッドシートに書き込み
-        worksheet.update([header] + values)
+        # 既存データのクリアと書き込みを1回のbatchUpdateで実行（値は解釈させずに文字列のまま書き込む）
+        rows = [
+            {'values': [{'userEnteredValue': {'stringValue': str(value)}} for value in row]}
+            for row in [header] + values
+        ]
+        spreadsheet.batch_update({
+            'requests': [
+                {
+                    'updateCells': {
+                        'range': {'sheetId': worksheet.id},
+                        'fields': 'userEnteredValue'
+                    }
+                },
+                {
+                    'updateCells': {
+                        'start': {'sheetId': worksheet.id, 'rowIndex': 0, 'columnIndex': 0},
+                        'rows': rows,
+                        'fields': 'userEnteredValue'
+                    }
+                }
+            ]
+        })
         
         return True
         
@@ -600,7 +731,7 @@ def main():
                     query += " " + " ".join(search_categories)
                 
                 with st.spinner(f"「{query}」で検索中..."):
-                    finder = InfluencerFinder()
+                    finder = get_finder()
                     results = finder.search_google(
                         query,
                         st.session_state.api_keys['google_api_key'],
@@ -729,11 +860,15 @@ def main():
             
             st.session_state.csv_filename = csv_filename
             
-            if st.button("CSVファイルを生成"):
-                csv_href = export_to_csv(st.session_state.filtered_results, csv_filename)
-                if csv_href:
-                    st.markdown(csv_href, unsafe_allow_html=True)
-                    st.success(f"{csv_filename} の生成に成功しました。上のリンクからダウンロードしてください。")
+            # ダウンロードボタンを直接表示（クリック時の再実行でボタンが消えないようにする）
+            csv_bytes = export_to_csv(st.session_state.filtered_results)
+            if csv_bytes:
+                st.download_button(
+                    "CSVファイルをダウンロード",
+                    data=csv_bytes,
+                    file_name=csv_filename,
+                    mime="text/csv"
+                )
             
             # Googleスプレッドシートエクスポート
             st.subheader("Googleスプレッドシートにエクスポート")
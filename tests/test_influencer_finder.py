@@ -0,0 +1,44 @@
+import importlib.util
+import os
+
+import pytest
+
+for dependency in ('streamlit', 'pandas', 'requests', 're2', 'selectolax', 'googleapiclient', 'gspread', 'google.oauth2'):
+    pytest.importorskip(dependency)
+
+# ファイル名にハイフンを含むため、パスを指定して読み込む
+_spec = importlib.util.spec_from_file_location(
+    'influencer_finder',
+    os.path.join(os.path.dirname(__file__), '..', 'influencer-finder.py')
+)
+influencer_finder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(influencer_finder)
+
+
+@pytest.fixture
+def finder():
+    return influencer_finder.InfluencerFinder()
+
+
+def test_extract_sns_urls_from_bytes(finder):
+    html = b'<a href="https://www.instagram.com/foo">IG</a> x.com/bar youtube.com/@baz'
+
+    sns_urls = finder._extract_sns_urls(html)
+
+    assert sns_urls == {
+        'instagram': 'https://www.instagram.com/foo',
+        'tiktok': '',
+        'youtube': 'https://youtube.com/@baz',
+        'x': 'https://x.com/bar',
+        'facebook': ''
+    }
+
+
+@pytest.mark.parametrize('content_type, html', [
+    ('text/html; charset=Shift_JIS', '<p>メールアドレスinfo@example.com</p>'),
+    ('text/html', '<meta charset="Shift_JIS"><p>メールアドレスinfo@example.com</p>'),
+])
+def test_extract_email_from_shift_jis_page(finder, content_type, html):
+    html_bytes = finder._to_utf8(html.encode('shift_jis'), content_type)
+
+    assert finder._extract_email(html_bytes) == 'info@example.com'